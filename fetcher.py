@@ -4,6 +4,9 @@ Quote Extractor - Extract random quotes from books (PDF, EPUB, TXT)
 with intelligent filtering and metadata tracking
 """
 
+import io
+import os
+import mmap
 import sys
 import random
 import re
@@ -11,7 +14,7 @@ import argparse
 import xml.etree.ElementTree as ET
 from pathlib import Path
 from typing import List, Set, Tuple, Optional
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 
 # PDF handling
@@ -30,6 +33,164 @@ try:
 except ImportError:
     HAS_EPUB = False
 
+# Optional linear-time regex engine for sentence splitting
+try:
+    import re2
+    HAS_RE2 = True
+except ImportError:
+    HAS_RE2 = False
+
+# Quote quality limits
+MIN_QUOTE_CHARS = 50
+MAX_QUOTE_CHARS = 500
+MIN_ALPHA_RATIO = 0.7
+MIN_QUOTE_ALPHA = MIN_QUOTE_CHARS * MIN_ALPHA_RATIO  # Fewest letters a valid quote can have
+
+# Dublin Core elements read from metadata.opf
+_DC_TITLE = '{http://purl.org/dc/elements/1.1/}title'
+_DC_CREATOR = '{http://purl.org/dc/elements/1.1/}creator'
+
+# Precompiled patterns
+_WS_RE = re.compile(r'\s+')
+_TRAIL_NUM_RE = re.compile(r'\b\d+\b\s*$')
+_SENT_SPLIT_RE = re.compile(r'(?<=[.!?])\s+(?=[A-Z])')
+
+# RE2 has no lookarounds, so it matches the whole boundary and we slice around it.
+# RE2's \s is ASCII-only, so spell out every code point the stdlib \s (str.isspace) matches
+if HAS_RE2:
+    _PY_WS_CLASS = ''.join(f'\\x{{{cp:x}}}' for cp in range(sys.maxunicode + 1) if chr(cp).isspace())
+    _SENT_BOUNDARY_RE2 = re2.compile(rf'[.!?][{_PY_WS_CLASS}]+[A-Z]')
+
+# Common abbreviations whose dots must not end a sentence
+_ABBREV_RE = re.compile(r'\b(?:Mr|Mrs|Ms|Dr|Prof|Sr|Jr|vs|etc|Inc|Ltd|Co)\.|\bi\.e\.|\be\.g\.')
+# Single-char sentinel standing in for a masked dot. U+FFFF is a noncharacter, so real text
+# shouldn't contain it (PDF extraction does emit NUL for lost ligatures, ruling that out)
+_ABBREV_DOT = '\uffff'
+
+
+def _mask_abbrev(match: re.Match) -> str:
+    return match.group(0).replace('.', _ABBREV_DOT)
+
+
+def _split_on_boundaries(text: str) -> List[str]:
+    """Split text after sentence-ending punctuation followed by whitespace and a capital"""
+    if not HAS_RE2:
+        return _SENT_SPLIT_RE.split(text)
+    
+    sentences = []
+    pos = 0
+    for match in _SENT_BOUNDARY_RE2.finditer(text):
+        # Keep the punctuation with this sentence and the capital with the next
+        sentences.append(text[pos:match.start() + 1])
+        pos = match.end() - 1
+    sentences.append(text[pos:])
+    return sentences
+
+
+# Character classes for ASCII bytes: D = digit, A = letter, . = anything else
+_CLASS_TABLE = bytes(
+    ord('D') if 48 <= i <= 57 else
+    ord('A') if 65 <= i <= 90 or 97 <= i <= 122 else
+    ord('.')
+    for i in range(256)
+)
+
+
+# ASCII bytes that are neither digits nor letters, dropped while classifying
+_OTHER_BYTES = bytes(i for i in range(256) if _CLASS_TABLE[i] == ord('.'))
+
+
+def _char_stats(text: str) -> Tuple[bool, int]:
+    """Classify the ASCII characters of text in one C-level pass, returning (has_digit, alpha_count)"""
+    # Only D and A markers survive the translate, so without digits the length is the letter count
+    classes = text.encode('ascii', 'ignore').translate(_CLASS_TABLE, _OTHER_BYTES)
+    if b'D' in classes:
+        return True, classes.count(b'A')
+    return False, len(classes)
+
+
+def _extract_pdf_pages(data: bytes, start: int, stop: int) -> List[str]:
+    """Extract text from a range of PDF pages with a private reader (readers are not thread-safe)"""
+    reader = pypdf.PdfReader(io.BytesIO(data))
+    return [reader.pages[i].extract_text() for i in range(start, stop)]
+
+
+def _clean_text(text: str) -> str:
+    """Clean and normalize text"""
+    # Remove excessive whitespace
+    text = _WS_RE.sub(' ', text).strip()
+    # Remove page numbers at end (only possible when the text ends in a digit)
+    if text[-1:].isdigit():
+        text = _TRAIL_NUM_RE.sub('', text).strip()
+    return text
+
+
+def _split_sentences(text: str) -> List[Tuple[str, int]]:
+    """Split text into (sentence, letter count) pairs with smart handling of abbreviations"""
+    # Mask the dots of common abbreviations so we don't split on them. Text that already
+    # contains the sentinel is split unmasked rather than having it turned into dots
+    if _ABBREV_DOT in text:
+        protected_text = text
+    else:
+        protected_text = _ABBREV_RE.sub(_mask_abbrev, text)
+    
+    # Split on sentence boundaries
+    sentences = _split_on_boundaries(protected_text)
+    
+    # Clean and filter sentences
+    cleaned = []
+    for s in sentences:
+        s = s.strip()
+        # Skip very short sentences, likely artifacts
+        if len(s) < 20:
+            continue
+        # Skip sentences with ANY digits (footnotes, page numbers, etc.)
+        has_digit, alpha_count = _char_stats(s)
+        if has_digit:
+            continue
+        # Skip lines that look like headers/titles (all caps, very short)
+        if len(s) < 50 and s.isupper():
+            continue
+        # Restore masked abbreviation dots
+        if protected_text is not text:
+            s = s.replace(_ABBREV_DOT, '.')
+        cleaned.append((s, alpha_count))
+    
+    return cleaned
+
+
+def _is_valid_quote(quote: str, seen: Set[int], stats: Optional[Tuple[bool, int]] = None) -> bool:
+    """Check if quote meets quality criteria and its hash isn't in seen"""
+    # Length check
+    if len(quote) < MIN_QUOTE_CHARS or len(quote) > MAX_QUOTE_CHARS:
+        return False
+    
+    # Must have reasonable punctuation
+    if not quote.endswith(('.', '!', '?')):
+        return False
+    
+    # Reuse the sentence classification when the caller already has it
+    has_digit, alpha_count = stats if stats is not None else _char_stats(quote)
+    
+    # Must not contain ANY digits
+    if has_digit:
+        return False
+    
+    # Should not be mostly special characters
+    alpha_ratio = alpha_count / len(quote)
+    if alpha_ratio < MIN_ALPHA_RATIO:
+        return False
+    
+    # Avoid quotes with too many special formatting artifacts
+    if quote.count('_') > 3 or quote.count('*') > 3:
+        return False
+    
+    # Check for duplicate
+    if hash(quote) in seen:
+        return False
+    
+    return True
+
 
 @dataclass
 class BookMetadata:
@@ -43,12 +204,17 @@ class BookMetadata:
 
 
 class QuoteExtractor:
-    def __init__(self, min_sentences=2, max_sentences=4, skip_start_chars=50000, skip_end_chars=125000):
+    # Supported book formats
+    BOOK_EXTENSIONS = frozenset({'.txt', '.pdf', '.epub'})
+    
+    def __init__(self, min_sentences=2, max_sentences=4, skip_start_chars=50000, skip_end_chars=125000,
+                 pdf_threads=1):
         self.min_sentences = min_sentences
         self.max_sentences = max_sentences
         self.skip_start_chars = skip_start_chars  # ~20 pages at 250 words/page
         self.skip_end_chars = skip_end_chars      # ~50 pages
-        self.extracted_quotes = set()  # Avoid duplicates
+        self.pdf_threads = pdf_threads            # Threads per PDF, 1 disables
+        self.extracted_quotes: Set[int] = set()  # Hashes of accepted quotes, to avoid duplicates
         
     def parse_opf_metadata(self, book_dir: Path) -> BookMetadata:
         """Parse metadata.opf file to extract title and author"""
@@ -58,34 +224,36 @@ class QuoteExtractor:
             return BookMetadata()
         
         try:
-            tree = ET.parse(opf_file)
-            root = tree.getroot()
-            
-            # Define namespaces
-            ns = {
-                'dc': 'http://purl.org/dc/elements/1.1/',
-                'opf': 'http://www.idpf.org/2007/opf'
-            }
-            
-            # Extract title
-            title_elem = root.find('.//dc:title', ns)
-            title = title_elem.text if title_elem is not None and title_elem.text else "Unknown"
+            title = author = None
             
-            # Extract author
-            author_elem = root.find('.//dc:creator', ns)
-            author = author_elem.text if author_elem is not None and author_elem.text else "Unknown"
+            # Stream the XML and stop as soon as the first title and author are seen
+            with open(opf_file, 'rb') as f:
+                for _, elem in ET.iterparse(f, events=('end',)):
+                    if elem.tag == _DC_TITLE and title is None:
+                        title = elem.text or ""
+                    elif elem.tag == _DC_CREATOR and author is None:
+                        author = elem.text or ""
+                    if title is not None and author is not None:
+                        break
+                    elem.clear()
             
-            return BookMetadata(title=title.strip(), author=author.strip())
+            return BookMetadata(title=(title or "Unknown").strip(), author=(author or "Unknown").strip())
             
         except Exception as e:
             print(f"Warning: Could not parse {opf_file}: {e}", file=sys.stderr)
             return BookMetadata()
     
     def extract_from_txt(self, file_path: Path) -> str:
-        """Extract text from TXT file as single string"""
+        """Extract the trimmed middle of a TXT file as single string"""
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                return f.read()
+            with open(file_path, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                if not size:
+                    return ""
+                # Map the file and only decode the part that survives trimming
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    start, end = self.trim_bounds(size)
+                    return mm[start:end].decode('utf-8', 'ignore')
         except Exception as e:
             print(f"Warning: Could not read {file_path}: {e}", file=sys.stderr)
             return ""
@@ -96,17 +264,38 @@ class QuoteExtractor:
             return ""
         
         try:
-            reader = pypdf.PdfReader(str(file_path))
-            texts = []
-            for page in reader.pages:
-                text = page.extract_text()
-                if text.strip():
-                    texts.append(text)
-            return '\n'.join(texts)
+            if self.pdf_threads > 1:
+                texts = self._extract_pdf_parallel(file_path)
+            else:
+                texts = (page.extract_text() for page in pypdf.PdfReader(str(file_path)).pages)
+            buf = io.StringIO()
+            for text in texts:
+                if text and not text.isspace():
+                    buf.write(text)
+                    buf.write('\n')
+            return buf.getvalue()
         except Exception as e:
             print(f"Warning: Could not read PDF {file_path}: {e}", file=sys.stderr)
             return ""
     
+    def _extract_pdf_parallel(self, file_path: Path) -> List[str]:
+        """Extract PDF page texts in order, splitting the pages across a thread pool"""
+        data = file_path.read_bytes()
+        reader = pypdf.PdfReader(io.BytesIO(data))
+        num_pages = len(reader.pages)
+        chunk = max(1, -(-num_pages // self.pdf_threads))
+        
+        # The reader used to count pages extracts the first chunk on this thread
+        with ThreadPoolExecutor(max_workers=self.pdf_threads - 1) as executor:
+            chunks = executor.map(
+                lambda start: _extract_pdf_pages(data, start, min(start + chunk, num_pages)),
+                range(chunk, num_pages, chunk)
+            )
+            texts = [reader.pages[i].extract_text() for i in range(min(chunk, num_pages))]
+            for rest in chunks:
+                texts.extend(rest)
+            return texts
+    
     def extract_from_epub(self, file_path: Path) -> str:
         """Extract text from EPUB file as single string"""
         if not HAS_EPUB:
@@ -114,146 +303,84 @@ class QuoteExtractor:
         
         try:
             book = epub.read_epub(str(file_path))
-            texts = []
+            buf = io.StringIO()
             
             for item in book.get_items():
                 if item.get_type() == ebooklib.ITEM_DOCUMENT:
                     soup = BeautifulSoup(item.get_content(), 'html.parser')
                     text = soup.get_text()
-                    if text.strip():
-                        texts.append(text)
-            return '\n'.join(texts)
+                    if text and not text.isspace():
+                        buf.write(text)
+                        buf.write('\n')
+            return buf.getvalue()
         except Exception as e:
             print(f"Warning: Could not read EPUB {file_path}: {e}", file=sys.stderr)
             return ""
     
     def clean_text(self, text: str) -> str:
         """Clean and normalize text"""
-        # Remove excessive whitespace
-        text = re.sub(r'\s+', ' ', text)
-        # Remove page numbers at end
-        text = re.sub(r'\b\d+\b\s*$', '', text)
-        return text.strip()
-    
-    def split_into_sentences(self, text: str) -> List[str]:
-        """Split text into sentences with smart handling of abbreviations"""
-        # Replace common abbreviations temporarily to avoid splitting on them
-        abbrev_map = {
-            'Mr.': 'Mr<dot>',
-            'Mrs.': 'Mrs<dot>',
-            'Ms.': 'Ms<dot>',
-            'Dr.': 'Dr<dot>',
-            'Prof.': 'Prof<dot>',
-            'Sr.': 'Sr<dot>',
-            'Jr.': 'Jr<dot>',
-            'vs.': 'vs<dot>',
-            'etc.': 'etc<dot>',
-            'i.e.': 'i<dot>e<dot>',
-            'e.g.': 'e<dot>g<dot>',
-            'Inc.': 'Inc<dot>',
-            'Ltd.': 'Ltd<dot>',
-            'Co.': 'Co<dot>',
-        }
-        
-        # Protect abbreviations
-        protected_text = text
-        for abbrev, replacement in abbrev_map.items():
-            protected_text = protected_text.replace(abbrev, replacement)
-        
-        # Split on sentence boundaries
-        sentences = re.split(r'(?<=[.!?])\s+(?=[A-Z])', protected_text)
-        
-        # Restore abbreviations
-        restored_sentences = []
-        for s in sentences:
-            for abbrev, replacement in abbrev_map.items():
-                s = s.replace(replacement, abbrev)
-            restored_sentences.append(s)
-        
-        sentences = restored_sentences
-        
-        # Clean and filter sentences
-        cleaned = []
-        for s in sentences:
-            s = s.strip()
-            # Skip very short sentences, likely artifacts
-            if len(s) < 20:
-                continue
-            # Skip sentences with ANY digits (footnotes, page numbers, etc.)
-            if re.search(r'\d', s):
-                continue
-            # Skip lines that look like headers/titles (all caps, very short)
-            if s.isupper() and len(s) < 50:
-                continue
-            cleaned.append(s)
+        return _clean_text(text)
+    
+    def split_into_sentences(self, text: str) -> List[Tuple[str, int]]:
+        """Split text into (sentence, letter count) pairs with smart handling of abbreviations"""
+        return _split_sentences(text)
+    
+    def trim_bounds(self, length: int) -> Tuple[int, int]:
+        """Get the (start, end) offsets of the part of a book kept after trimming"""
+        if length < (self.skip_start_chars + self.skip_end_chars):
+            # Book too short, keep middle portion if possible
+            if length > self.skip_start_chars:
+                return self.skip_start_chars, length
+            return 0, length
         
-        return cleaned
+        # Remove beginning and end
+        return self.skip_start_chars, length - self.skip_end_chars
     
     def trim_book_content(self, text: str) -> str:
         """Remove first and last portions of the book"""
-        if len(text) < (self.skip_start_chars + self.skip_end_chars):
-            # Book too short, return middle portion if possible
-            if len(text) > self.skip_start_chars:
-                return text[self.skip_start_chars:]
-            return text
-        
-        # Remove beginning and end
-        trimmed = text[self.skip_start_chars:-self.skip_end_chars]
-        return trimmed
+        start, end = self.trim_bounds(len(text))
+        return text[start:end]
     
-    def is_valid_quote(self, quote: str) -> bool:
+    def is_valid_quote(self, quote: str, stats: Optional[Tuple[bool, int]] = None) -> bool:
         """Check if quote meets quality criteria"""
-        # Length check
-        if len(quote) < 50 or len(quote) > 500:
-            return False
-        
-        # Must have reasonable punctuation
-        if not re.search(r'[.!?]$', quote):
-            return False
-        
-        # Must not contain ANY digits
-        if re.search(r'\d', quote):
-            return False
-        
-        # Should not be mostly special characters
-        alpha_ratio = len(re.findall(r'[a-zA-Z]', quote)) / len(quote)
-        if alpha_ratio < 0.7:
-            return False
-        
-        # Avoid quotes with too many special formatting artifacts
-        if quote.count('_') > 3 or quote.count('*') > 3:
-            return False
-        
-        # Check for duplicate
-        if quote in self.extracted_quotes:
-            return False
-        
-        return True
+        return _is_valid_quote(quote, self.extracted_quotes, stats)
     
-    def extract_quote_from_sentences(self, sentences: List[str]) -> Optional[str]:
-        """Create a quote from a random sequence of sentences"""
+    def extract_quote_from_sentences(self, sentences: List[Tuple[str, int]], start_idx: Optional[int] = None,
+                                     num_sentences: Optional[int] = None) -> Optional[str]:
+        """Create a quote from a random (or the given) sequence of sentences"""
         if len(sentences) < self.min_sentences:
             return None
         
-        # Pick random starting point
-        max_start = len(sentences) - self.min_sentences
-        if max_start < 0:
-            return None
-        
-        start_idx = random.randint(0, max_start)
+        if start_idx is None:
+            # Pick random starting point
+            max_start = len(sentences) - self.min_sentences
+            start_idx = random.randint(0, max_start)
         
         # Pick random length within bounds
         max_length = min(self.max_sentences, len(sentences) - start_idx)
         if max_length < self.min_sentences:
             return None
         
-        num_sentences = random.randint(self.min_sentences, max_length)
+        # A pre-drawn length that no longer fits near the end of the book is redrawn rather
+        # than clamped, so window lengths stay uniform over what is left
+        if num_sentences is None or num_sentences > max_length:
+            num_sentences = random.randint(self.min_sentences, max_length)
+        
+        chosen = sentences[start_idx:start_idx + num_sentences]
+        alpha_count = sum(a for _, a in chosen)
+        
+        # Reject windows that can't pass is_valid_quote before building the string:
+        # cleaning only shortens the text, and a valid quote needs enough letters
+        raw_length = sum(len(s) for s, _ in chosen) + len(chosen) - 1
+        if raw_length < MIN_QUOTE_CHARS or not MIN_QUOTE_ALPHA <= alpha_count <= MAX_QUOTE_CHARS:
+            return None
         
         # Combine sentences
-        quote = ' '.join(sentences[start_idx:start_idx + num_sentences])
-        quote = self.clean_text(quote)
+        quote = _clean_text(' '.join(s for s, _ in chosen))
+        # Sentences with digits were already dropped, and cleaning never removes letters
+        stats = (False, alpha_count)
         
-        return quote if self.is_valid_quote(quote) else None
+        return quote if _is_valid_quote(quote, self.extracted_quotes, stats) else None
     
     def extract_quotes_from_file(self, file_path: Path, metadata: BookMetadata, 
                                   num_attempts: int = 5) -> List[Tuple[str, BookMetadata]]:
@@ -262,29 +389,31 @@ class QuoteExtractor:
         suffix = file_path.suffix.lower()
         
         if suffix == '.txt':
-            full_text = self.extract_from_txt(file_path)
-        elif suffix == '.pdf':
-            if not HAS_PDF:
+            # Trimmed while reading
+            trimmed_text = self.extract_from_txt(file_path)
+        else:
+            if suffix == '.pdf':
+                if not HAS_PDF:
+                    return []
+                full_text = self.extract_from_pdf(file_path)
+            elif suffix == '.epub':
+                if not HAS_EPUB:
+                    return []
+                full_text = self.extract_from_epub(file_path)
+            else:
                 return []
-            full_text = self.extract_from_pdf(file_path)
-        elif suffix == '.epub':
-            if not HAS_EPUB:
+            
+            if not full_text:
                 return []
-            full_text = self.extract_from_epub(file_path)
-        else:
-            return []
-        
-        if not full_text:
-            return []
-        
-        # Trim beginning and end of book
-        trimmed_text = self.trim_book_content(full_text)
+            
+            # Trim beginning and end of book
+            trimmed_text = self.trim_book_content(full_text)
         
         if not trimmed_text:
             return []
         
         # Split into sentences
-        sentences = self.split_into_sentences(trimmed_text)
+        sentences = _split_sentences(trimmed_text)
         
         if len(sentences) < self.min_sentences:
             return []
@@ -294,10 +423,15 @@ class QuoteExtractor:
         attempts = 0
         max_total_attempts = num_attempts * 3  # Allow more tries to find valid quotes
         
+        # Draw every attempt's start and length up front with one random.choices call per field,
+        # instead of two randint calls per attempt
+        starts = random.choices(range(len(sentences) - self.min_sentences + 1), k=max_total_attempts)
+        lengths = random.choices(range(self.min_sentences, self.max_sentences + 1), k=max_total_attempts)
+        
         while len(quotes) < num_attempts and attempts < max_total_attempts:
-            quote = self.extract_quote_from_sentences(sentences)
+            quote = self.extract_quote_from_sentences(sentences, starts[attempts], lengths[attempts])
             if quote:
-                self.extracted_quotes.add(quote)
+                self.extracted_quotes.add(hash(quote))
                 quotes.append((quote, metadata))
             attempts += 1
         
@@ -305,73 +439,111 @@ class QuoteExtractor:
     
     def find_book_files(self, root_dir: Path) -> List[Path]:
         """Recursively find all supported book files"""
-        extensions = ['.txt', '.pdf', '.epub']
+        extensions = self.BOOK_EXTENSIONS
         files = []
+        pending = [str(root_dir)]
         
-        for ext in extensions:
-            files.extend(root_dir.rglob(f'*{ext}'))
+        # Single walk over the tree, checking each file's suffix once
+        while pending:
+            try:
+                with os.scandir(pending.pop()) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                        elif os.path.splitext(entry.name)[1].lower() in extensions:
+                            files.append(Path(entry.path))
+            except OSError:
+                # Unreadable directories, or a root that isn't a directory, are skipped like rglob did
+                continue
         
         return files
 
 
-def process_single_file(args: Tuple) -> Tuple[Path, List[Tuple[str, BookMetadata]]]:
-    """Process a single file (for parallel execution)"""
-    file_path, min_sentences, max_sentences, skip_start, skip_end, quotes_per_file = args
-    
-    # Create new extractor instance for this process
-    extractor = QuoteExtractor(
+# Extractor shared by every task run in a worker process, set up by _init_worker
+_EXTRACTOR: Optional[QuoteExtractor] = None
+
+
+def _init_worker(min_sentences: int, max_sentences: int, skip_start: int, skip_end: int, pdf_threads: int):
+    """Build the worker's extractor once when the process starts"""
+    global _EXTRACTOR
+    _EXTRACTOR = QuoteExtractor(
         min_sentences=min_sentences,
         max_sentences=max_sentences,
         skip_start_chars=skip_start,
-        skip_end_chars=skip_end
+        skip_end_chars=skip_end,
+        pdf_threads=pdf_threads
     )
+
+
+def process_single_file(args: Tuple) -> Tuple[Path, BookMetadata, List[str]]:
+    """Process a single file (for parallel execution)"""
+    file_path, quotes_per_file = args
     
     # Get metadata from the book's directory
     book_dir = file_path.parent
-    metadata = extractor.parse_opf_metadata(book_dir)
+    metadata = _EXTRACTOR.parse_opf_metadata(book_dir)
     
     # Extract quotes
-    quotes = extractor.extract_quotes_from_file(file_path, metadata, quotes_per_file)
+    quotes = _EXTRACTOR.extract_quotes_from_file(file_path, metadata, quotes_per_file)
     
-    return file_path, quotes
+    # Every quote shares the book's metadata, so send it back to the parent only once
+    return file_path, metadata, [quote for quote, _ in quotes]
 
 
-def save_quote_immediately(quote: str, metadata: BookMetadata, output_dir: Path, counter: List[int]):
-    """Save a single quote immediately with metadata"""
+# Flags for creating (or overwriting) a quote file
+_QUOTE_OPEN_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+
+
+def save_quotes_batch(quotes: List[str], metadata: BookMetadata, output_dir: Path, counter: List[int]) -> int:
+    """Save a batch of quotes from one book with its metadata, one file each, and return how many were saved"""
     output_dir.mkdir(exist_ok=True)
+    metadata_line = metadata.format_metadata_line()
     
-    # Increment and get current counter
-    counter[0] += 1
-    quote_num = counter[0]
-    
-    file_path = output_dir / f'quote_{quote_num}.txt'
+    # Resolve the directory once and create every quote file relative to it
+    dir_fd = os.open(output_dir, os.O_RDONLY) if os.open in os.supports_dir_fd else None
+    saved = 0
     
     try:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(quote + '\n')
-            f.write(metadata.format_metadata_line() + '\n')
-        return True
-    except Exception as e:
-        print(f"Error saving {file_path}: {e}", file=sys.stderr)
-        return False
+        for quote in quotes:
+            # Increment and get current counter
+            counter[0] += 1
+            file_path = output_dir / f'quote_{counter[0]}.txt'
+            data = f"{quote}\n{metadata_line}\n".encode('utf-8')
+            
+            try:
+                if dir_fd is not None:
+                    fd = os.open(file_path.name, _QUOTE_OPEN_FLAGS, 0o666, dir_fd=dir_fd)
+                else:
+                    fd = os.open(file_path, _QUOTE_OPEN_FLAGS, 0o666)
+                # The file object owns fd and keeps writing until all of data is out
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(data)
+                saved += 1
+            except OSError as e:
+                print(f"Error saving {file_path}: {e}", file=sys.stderr)
+    finally:
+        if dir_fd is not None:
+            os.close(dir_fd)
+    
+    return saved
 
 
 def get_starting_quote_number(output_dir: Path) -> int:
     """Find the next available quote number"""
-    if not output_dir.exists():
-        return 1
-    
-    existing = list(output_dir.glob('quote_*.txt'))
-    if not existing:
+    if not output_dir.is_dir():
         return 1
     
-    numbers = []
-    for f in existing:
-        match = re.search(r'quote_(\d+)\.txt', f.name)
-        if match:
-            numbers.append(int(match.group(1)))
-    
-    return max(numbers) + 1 if numbers else 1
+    # Keep a running max over the directory entries instead of collecting them
+    highest = 0
+    with os.scandir(output_dir) as it:
+        for entry in it:
+            name = entry.name
+            if name.startswith('quote_') and name.endswith('.txt'):
+                digits = name[6:-4]
+                if digits.isdecimal():
+                    highest = max(highest, int(digits))
+    
+    return highest + 1
 
 
 def main():
@@ -388,6 +560,7 @@ Examples:
   
 Supported formats: TXT, PDF, EPUB
 Requirements: pip install pypdf ebooklib beautifulsoup4
+Optional: pip install google-re2 (faster sentence splitting)
         '''
     )
     
@@ -405,6 +578,9 @@ Requirements: pip install pypdf ebooklib beautifulsoup4
                         help='Max quotes to extract per book file (default: 5)')
     parser.add_argument('-p', '--processes', type=int, default=4,
                         help='Number of parallel processes (default: 4)')
+    parser.add_argument('--pdf-threads', type=int, default=1,
+                        help='Threads per PDF when running one process; pypdf is pure Python, '
+                             'so gains are limited by the GIL (default: 1)')
     parser.add_argument('--skip-start', type=int, default=50000,
                         help='Characters to skip at start (~20 pages, default: 50000)')
     parser.add_argument('--skip-end', type=int, default=125000,
@@ -440,14 +616,8 @@ Requirements: pip install pypdf ebooklib beautifulsoup4
         print("Warning: ebooklib and beautifulsoup4 not installed. EPUB files will be skipped.")
         print("Install with: pip install ebooklib beautifulsoup4")
     
-    # Shuffle files for random selection
-    random.shuffle(book_files)
-    
-    # Prepare arguments for parallel processing
-    file_args = [
-        (f, args.min_sentences, args.max_sentences, args.skip_start, args.skip_end, args.quotes_per_file)
-        for f in book_files
-    ]
+    # Only split PDFs across threads when asked and not already running several processes
+    pdf_threads = args.pdf_threads if args.processes == 1 else 1
     
     # Get starting quote number
     quote_counter = [get_starting_quote_number(args.output) - 1]
@@ -459,13 +629,20 @@ Requirements: pip install pypdf ebooklib beautifulsoup4
     print(f"Filtering out any quotes containing digits\n")
     
     # Process files in parallel
-    with ProcessPoolExecutor(max_workers=args.processes) as executor:
+    with ProcessPoolExecutor(
+        max_workers=args.processes,
+        initializer=_init_worker,
+        initargs=(args.min_sentences, args.max_sentences, args.skip_start, args.skip_end, pdf_threads)
+    ) as executor:
         # Submit jobs incrementally to avoid processing too many files
         future_to_file = {}
-        file_iter = iter(file_args)
+        
+        # Visit files in random order, building each job's arguments only when it is submitted
+        order = random.sample(range(len(book_files)), len(book_files))
+        file_iter = ((book_files[i], args.quotes_per_file) for i in order)
         
         # Submit initial batch
-        for _ in range(min(args.processes * 2, len(file_args))):
+        for _ in range(min(args.processes * 2, len(book_files))):
             try:
                 arg = next(file_iter)
                 future = executor.submit(process_single_file, arg)
@@ -485,19 +662,14 @@ Requirements: pip install pypdf ebooklib beautifulsoup4
             file_path = future_to_file[future]
             
             try:
-                _, quotes_with_metadata = future.result()
+                _, metadata, quotes = future.result()
                 
-                if quotes_with_metadata:
+                if quotes:
                     print(f"Processing: {file_path.name}... ", end='')
                     
-                    saved_from_file = 0
-                    for quote, metadata in quotes_with_metadata:
-                        if total_saved >= args.num_quotes:
-                            break
-                        
-                        if save_quote_immediately(quote, metadata, args.output, quote_counter):
-                            total_saved += 1
-                            saved_from_file += 1
+                    batch = quotes[:args.num_quotes - total_saved]
+                    saved_from_file = save_quotes_batch(batch, metadata, args.output, quote_counter)
+                    total_saved += saved_from_file
                     
                     print(f"✓ ({saved_from_file} quotes saved)")
                     files_processed += 1
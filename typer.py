@@ -11,6 +11,7 @@ import csv
 import curses
 import unicodedata
 import argparse  # Import the argparse library
+from collections import Counter, deque
 from datetime import datetime
 from pathlib import Path
 
@@ -67,19 +68,53 @@ class RewardConfig:
     }
 
 
+# Accent-free text for each non-ASCII code point folded so far
+_ACCENT_FOLD_CACHE = {}
+
+
+def _fold_char(cp):
+    """Remove accents from a single code point, computing each one only once"""
+    folded = _ACCENT_FOLD_CACHE.get(cp)
+    if folded is None:
+        nfd = unicodedata.normalize('NFD', chr(cp))
+        folded = ''.join(char for char in nfd if unicodedata.category(char) != 'Mn')
+        _ACCENT_FOLD_CACHE[cp] = folded
+    return folded
+
+
+def _extract_tag(tag, line):
+    """Get the value of a [[TAG: value]] field in a metadata line, or None if absent"""
+    start = line.find(f'[[{tag}:')
+    if start < 0:
+        return None
+    end = line.find(']]', start)
+    if end < 0:
+        return None
+    return line[start + len(tag) + 3:end].strip()
+
+
 class TyperacerGame:
     def __init__(self, quote_pack="quotes"):
         """Initialize the game with a specific quote pack (directory)."""
         self.quotes_dir = Path(quote_pack)
         self.quote_pack_name = quote_pack
         self.stats_file = Path("typing_stats.csv")
+        self._quote_files = None  # Cached listing of the quote pack
         self.quote = ""
         self.quote_metadata = ""
+        self.quote_norm = []   # Accent-normalized quote, one entry per character
+        self.quote_folded = ""  # Accent-normalized quote as a single string
+        self._accent_table = {}  # Translate table folding the quote's accented characters
         self.typed_text = ""
+        self.typed_norm = []   # Accent-normalized typed text, one entry per character
+        self._completed = False  # is_complete() as of the last edit to typed_text
         self.start_time = None
         self.end_time = None
         self.errors = 0
-        self.session_stats = []
+        # Per-round session results, one list per field (see record_round)
+        self._wpm_list = []
+        self._time_list = []
+        self._tier_list = []
         self.initialize_stats_file()
 
         # Translation table for normalizing quotes
@@ -91,55 +126,70 @@ class TyperacerGame:
             0x2019: "'",  # ' Right single quote
         })        
     
+    @property
+    def session_stats(self):
+        """Session results as one dict per round"""
+        return [{'wpm': wpm, 'time': elapsed, 'tier': tier}
+                for wpm, elapsed, tier in zip(self._wpm_list, self._time_list, self._tier_list)]
+    
+    def record_round(self, wpm, elapsed_time, tier):
+        """Add a finished round to the session results"""
+        self._wpm_list.append(wpm)
+        self._time_list.append(elapsed_time)
+        self._tier_list.append(tier)
+    
     def normalize_text(self, text):
         """Normalize different kinds of quotes to standard ones."""
         return text.translate(self.quote_normalization_table)
     
-    def normalize_accents(self, text):
-        """Remove accents from characters (e.g., ö -> o, é -> e)"""
-        # Decompose unicode characters into base + combining characters
-        nfd = unicodedata.normalize('NFD', text)
-        # Filter out combining characters (accents)
-        without_accents = ''.join(char for char in nfd if unicodedata.category(char) != 'Mn')
-        return without_accents
-
     def initialize_stats_file(self):
-        """Create stats CSV file if it doesn't exist"""
+        """Create stats CSV file if it doesn't exist and open it for appending"""
         if not self.stats_file.exists():
             with open(self.stats_file, 'w', newline='') as f:
                 writer = csv.writer(f)
                 writer.writerow(['timestamp', 'date', 'time', 'wpm', 'errors', 'duration_seconds', 'tier', 'pack'])
+        
+        # Kept open for the whole session; rows are flushed by close()
+        self._stats_fh = open(self.stats_file, 'a', newline='', buffering=8192)
+        self._stats_writer = csv.writer(self._stats_fh)
+    
+    def close(self):
+        """Flush and close the stats file"""
+        if not self._stats_fh.closed:
+            self._stats_fh.close()
     
-    def calculate_tier(self, wpm, errors):
+    def calculate_tier(self, wpm, errors,
+                       _pristine_wpm=RewardConfig.PRISTINE_WPM,
+                       _pristine_max_errors=RewardConfig.PRISTINE_MAX_ERRORS,
+                       _exceptional_wpm=RewardConfig.EXCEPTIONAL_WPM,
+                       _adequate_wpm=RewardConfig.ADEQUATE_WPM):
         """Determine the reward tier based on performance"""
+        # Thresholds are bound as defaults when the class is defined
         # Check for Pristine first (highest tier)
-        if wpm >= RewardConfig.PRISTINE_WPM and errors <= RewardConfig.PRISTINE_MAX_ERRORS:
+        if wpm >= _pristine_wpm and errors <= _pristine_max_errors:
             return 'pristine'
         # Check for Exceptional
-        elif wpm >= RewardConfig.EXCEPTIONAL_WPM:
+        if wpm >= _exceptional_wpm:
             return 'exceptional'
         # Check for Adequate
-        elif wpm >= RewardConfig.ADEQUATE_WPM:
+        if wpm >= _adequate_wpm:
             return 'adequate'
         # Otherwise it's Disaster
-        else:
-            return 'disaster'
+        return 'disaster'
     
     def save_stats(self, wpm, elapsed_time, tier):
         """Save stats to CSV file"""
         now = datetime.now()
-        with open(self.stats_file, 'a', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerow([
-                now.isoformat(),
-                now.strftime('%Y-%m-%d'),
-                now.strftime('%H:%M:%S'),
-                wpm,
-                self.errors,
-                round(elapsed_time, 2),
-                tier,
-                self.quote_pack_name
-            ])
+        self._stats_writer.writerow([
+            now.isoformat(),
+            now.strftime('%Y-%m-%d'),
+            now.strftime('%H:%M:%S'),
+            wpm,
+            self.errors,
+            round(elapsed_time, 2),
+            tier,
+            self.quote_pack_name
+        ])
     
     def get_historical_stats(self):
         """Get historical statistics from CSV"""
@@ -147,30 +197,33 @@ class TyperacerGame:
             return None
         
         try:
-            with open(self.stats_file, 'r') as f:
-                reader = csv.DictReader(f)
-                rows = list(reader)
-                
-            if len(rows) == 0:
-                return None
-            
-            wpms = [float(row['wpm']) for row in rows]
-            recent_wpms = wpms[-5:] if len(wpms) > 5 else wpms
+            # Single streaming pass: running totals, last 5 rounds and tier counts
+            total = 0.0
+            count = 0
+            best = 0.0
+            recent_wpms = deque(maxlen=5)
+            tier_counts = Counter()
+            with open(self.stats_file, 'r', newline='') as f:
+                for row in csv.DictReader(f):
+                    wpm = float(row['wpm'])
+                    total += wpm
+                    count += 1
+                    if count == 1 or wpm > best:
+                        best = wpm
+                    recent_wpms.append(wpm)
+                    tier_counts[row.get('tier', 'unknown')] += 1
             
-            # Count tier achievements
-            tier_counts = {}
-            for row in rows:
-                tier = row.get('tier', 'unknown')
-                tier_counts[tier] = tier_counts.get(tier, 0) + 1
+            if count == 0:
+                return None
             
             return {
-                'total_rounds': len(rows),
-                'avg_wpm': round(sum(wpms) / len(wpms), 1),
+                'total_rounds': count,
+                'avg_wpm': round(total / count, 1),
                 'recent_avg_wpm': round(sum(recent_wpms) / len(recent_wpms), 1),
-                'best_wpm': round(max(wpms), 1),
+                'best_wpm': round(best, 1),
                 'tier_counts': tier_counts
             }
-        except:
+        except (OSError, ValueError, KeyError, TypeError, csv.Error):
             return None
     
     def parse_metadata(self, lines):
@@ -183,29 +236,37 @@ class TyperacerGame:
             return ""
         
         # Parse [[BOOK: ...]][[AUTHOR: ...]] format
-        import re
         parts = []
         
-        book_match = re.search(r'\[\[BOOK:\s*([^\]]+)\]\]', metadata_line)
-        if book_match:
-            parts.append(book_match.group(1).strip())
+        book = _extract_tag('BOOK', metadata_line)
+        if book is not None:
+            parts.append(book)
         
-        author_match = re.search(r'\[\[AUTHOR:\s*([^\]]+)\]\]', metadata_line)
-        if author_match:
-            parts.append(author_match.group(1).strip())
+        author = _extract_tag('AUTHOR', metadata_line)
+        if author is not None:
+            parts.append(author)
         
         return " · ".join(parts) if parts else ""
     
     def load_quotes(self):
-        quote_files = list(self.quotes_dir.glob("*.txt"))
-        if not quote_files:
-            raise FileNotFoundError(f"No quote files found in '{self.quotes_dir}' directory")
+        # Scan the pack directory once per session
+        if self._quote_files is None:
+            quote_files = list(self.quotes_dir.glob("*.txt"))
+            if not quote_files:
+                raise FileNotFoundError(f"No quote files found in '{self.quotes_dir}' directory")
+            self._quote_files = quote_files
         
-        selected_file = random.choice(quote_files)
-        lines = selected_file.read_text().strip().split('\n')
+        selected_file = random.choice(self._quote_files)
+        # Only the quote and metadata lines are used
+        lines = selected_file.read_text(encoding='utf-8').strip().split('\n', 2)
         
         raw_quote = lines[0].strip()
         self.quote = self.normalize_text(raw_quote)
+        
+        # Fold each distinct accented character of the quote once, then translate in C
+        self._accent_table = {cp: _fold_char(cp) for cp in set(map(ord, self.quote)) if cp > 127}
+        self.quote_folded = self.quote.translate(self._accent_table)
+        self.quote_norm = [self._accent_table.get(ord(c), c) for c in self.quote]
         self.quote_metadata = self.parse_metadata(lines)
 
     def calculate_wpm(self):
@@ -227,18 +288,14 @@ class TyperacerGame:
         if len(self.typed_text) != len(self.quote):
             return False
         
-        # Compare character by character with accent normalization
-        for i in range(len(self.quote)):
-            typed_char = self.normalize_accents(self.typed_text[i])
-            quote_char = self.normalize_accents(self.quote[i])
-            if typed_char != quote_char:
-                return False
-        
-        return True
+        # Compare the accent-folded strings in one go
+        return self.typed_text.translate(self._accent_table) == self.quote_folded
     
     def reset_for_new_round(self):
         """Reset game state for a new round"""
         self.typed_text = ""
+        self.typed_norm = []
+        self._completed = self.is_complete()  # Only true for an empty quote
         self.start_time = None
         self.end_time = None
         self.errors = 0
@@ -247,6 +304,14 @@ class TyperacerGame:
 class CursesUI:
     """Handles all curses-based UI rendering"""
     
+    # Milliseconds getch waits for a key before returning -1 for a WPM update
+    WPM_TICK_MS = 100
+    
+    # Quote character states, tracked to repaint only cells that change
+    CHAR_UNTYPED = 0
+    CHAR_CORRECT = 1
+    CHAR_WRONG = 2
+    
     def __init__(self, stdscr):
         self.stdscr = stdscr
         self.height, self.width = stdscr.getmaxyx()
@@ -266,14 +331,39 @@ class CursesUI:
         
         self.stdscr.nodelay(False)
         self.stdscr.keypad(True)
+        
+        # Wake up periodically while typing so the WPM display keeps ticking
+        self.stdscr.timeout(self.WPM_TICK_MS)
+        
+        # Wrapped quote layout, rebuilt when the quote or terminal size changes
+        self._layout_cache = None
+        
+        # What the game screen currently shows, for incremental repaints
+        self._painted_layout = None
+        self._last_char_states = bytearray()
+        self._last_typed_len = 0
+        self._last_wpm = None
+    
+    def wait_for_key(self):
+        """Block until a key is pressed, ignoring the WPM tick timeout"""
+        self.stdscr.timeout(-1)
+        try:
+            return self.stdscr.getch()
+        finally:
+            self.stdscr.timeout(self.WPM_TICK_MS)
     
     def center_text(self, y, text, attr=0):
         """Print centered text at given y coordinate"""
         if y >= self.height or y < 0:
             return
-        x = max(0, (self.width - len(text)) // 2)
+        width = self.width
+        text_len = len(text)
+        x = max(0, (width - text_len) // 2)
+        # Only truncate text that is wider than the screen
+        if text_len > width:
+            text = text[:width]
         try:
-            self.stdscr.addstr(y, x, text[:self.width], attr)
+            self.stdscr.addstr(y, x, text, attr)
         except curses.error:
             pass
     
@@ -311,7 +401,7 @@ class CursesUI:
         self.center_text(y, "press any key to start", curses.A_DIM)
         
         self.stdscr.refresh()
-        self.stdscr.getch()
+        self.wait_for_key()
     
     def wrap_text_preserve_chars(self, text, width):
         """Wrap text at word boundaries without breaking words"""
@@ -319,75 +409,58 @@ class CursesUI:
             return []
         
         lines = []
-        words = text.split(' ')
-        current_line = ""
-        
-        for i, word in enumerate(words):
-            # Check if this is the first word on the line
-            if not current_line:
-                # Start a new line with this word
-                if len(word) <= width:
-                    current_line = word
-                else:
-                    # Word is too long, must break it
-                    while len(word) > width:
-                        lines.append(word[:width])
-                        word = word[width:]
-                    current_line = word
-            else:
+        # Words on the current line and the running length of ' '.join(buf)
+        buf = []
+        buf_len = 0
+        
+        for word in text.split(' '):
+            word_len = len(word)
+            if buf_len:
                 # Try adding word with a space
-                test_line = current_line + ' ' + word
-                if len(test_line) <= width:
-                    current_line = test_line
-                else:
-                    # Can't fit, save current line and start new one
-                    lines.append(current_line)
-                    if len(word) <= width:
-                        current_line = word
-                    else:
-                        # Word is too long, must break it
-                        while len(word) > width:
-                            lines.append(word[:width])
-                            word = word[width:]
-                        current_line = word
+                if buf_len + 1 + word_len <= width:
+                    buf.append(word)
+                    buf_len += 1 + word_len
+                    continue
+                # Can't fit, save current line and start new one
+                lines.append(' '.join(buf))
+            
+            # Start a new line with this word, breaking it if it is too long
+            start = 0
+            while word_len - start > width:
+                lines.append(word[start:start + width])
+                start += width
+            buf = [word[start:]]
+            buf_len = word_len - start
         
         # Don't forget the last line
-        if current_line:
-            lines.append(current_line)
+        if buf_len:
+            lines.append(' '.join(buf))
         
         return lines
     
-    def render_game_screen(self, game):
-        """Render minimal game screen"""
-        self.stdscr.clear()
-        
-        wrap_width = max(10, self.width - 10)
-        
-        # Wrap text preserving character count
-        quote_lines = self.wrap_text_preserve_chars(game.quote, wrap_width)
-
-        num_quote_lines = len(quote_lines)
-        
-        # Calculate vertical center for the entire game display block
-        block_height = num_quote_lines + 4  # Quote lines + WPM + metadata
-        start_y = max(0, (self.height - block_height) // 2)
-        
-        # WPM display at top
-        wpm = game.calculate_wpm()
-        if wpm > 0:
-            self.center_text(start_y, f"{wpm} wpm", curses.color_pair(5))
-        
-        # Render quote
-        self.render_quote(start_y + 2, game, quote_lines)
-        
-        # Show metadata instead of progress counter
-        if game.quote_metadata:
-            self.center_text(start_y + 2 + num_quote_lines + 1, game.quote_metadata, curses.A_DIM)
+    def get_layout(self, game):
+        """Get the wrapped quote lines, block start row and per-character positions for the current quote"""
+        key = (id(game.quote), self.width, self.height)
+        if self._layout_cache is None or self._layout_cache[0] != key:
+            wrap_width = max(10, self.width - 10)
+            
+            # Wrap text preserving character count
+            quote_lines = self.wrap_text_preserve_chars(game.quote, wrap_width)
+            
+            # Calculate vertical center for the entire game display block
+            block_height = len(quote_lines) + 4  # Quote lines + WPM + metadata
+            start_y = max(0, (self.height - block_height) // 2)
+            
+            char_positions = self.layout_quote(start_y + 2, game.quote, quote_lines)
+            self._layout_cache = (key, quote_lines, start_y, char_positions)
         
-        self.stdscr.refresh()
-
-    def render_quote(self, start_y, game, quote_lines):
-        """Render the quote with color-coded characters"""
+        return self._layout_cache[1:]
+    
+    def layout_quote(self, start_y, quote, quote_lines):
+        """Map each quote character to its (y, x) screen cell, or None if it isn't drawn"""
+        quote_len = len(quote)
+        last_line = len(quote_lines) - 1
+        char_positions = [None] * quote_len
         char_index = 0
         
         for i, line in enumerate(quote_lines):
@@ -397,42 +470,129 @@ class CursesUI:
             
             start_x = max(0, (self.width - len(line)) // 2)
             
-            # Render each character from the original quote
-            for j in range(len(line)):
-                if char_index >= len(game.quote):
-                    break
-                    
-                x = start_x + j
-                if x >= self.width:
-                    break
-                
-                quote_char = game.quote[char_index]
-                
-                try:
-                    if char_index < len(game.typed_text):
-                        # Normalize both for comparison (handles accents)
-                        typed_normalized = game.normalize_accents(game.typed_text[char_index])
-                        quote_normalized = game.normalize_accents(quote_char)
-                        
-                        if typed_normalized == quote_normalized:
-                            # Correct character
-                            self.stdscr.addstr(y, x, quote_char, curses.color_pair(1))
-                        else:
-                            # Incorrect character
-                            self.stdscr.addstr(y, x, quote_char, curses.color_pair(2) | curses.A_BOLD)
-                    else:
-                        # Not yet typed
-                        self.stdscr.addstr(y, x, quote_char, curses.color_pair(3) | curses.A_DIM)
-                except curses.error:
-                    pass
-                
-                char_index += 1
+            # Fill the whole line at once, clipped to the quote and the screen edge
+            count = min(len(line), quote_len - char_index, self.width - start_x)
+            if count > 0:
+                char_positions[char_index:char_index + count] = [(y, x) for x in range(start_x, start_x + count)]
+                char_index += count
             
-            # Add space between words (the space that was removed by split)
-            # But only if we're not at the last line
-            if i < len(quote_lines) - 1 and char_index < len(game.quote):
-                if game.quote[char_index] == ' ':
+            # Skip the space between words that was removed by the wrap
+            # But only if we're not at the last line; it keeps its None entry
+            if i < last_line and char_index < quote_len:
+                if quote[char_index] == ' ':
                     char_index += 1
+        
+        return char_positions
+    
+    def handle_resize(self):
+        """Re-read the terminal size and drop the layout built for the old one"""
+        self.height, self.width = self.stdscr.getmaxyx()
+        self._layout_cache = None
+    
+    def render_game_screen(self, game, dirty_from=None):
+        """Render minimal game screen, repainting only what changed since the last frame
+        
+        dirty_from is the lowest typed index edited since the last frame, for edits
+        that leave the typed length where it was (e.g. backspace then retype).
+        """
+        quote_lines, start_y, char_positions = self.get_layout(game)
+        num_quote_lines = len(quote_lines)
+        typed_len = len(game.typed_text)
+        
+        if self._layout_cache is not self._painted_layout:
+            # New quote or terminal size: clear and paint everything once
+            self.stdscr.clear()
+            self._painted_layout = self._layout_cache
+            self._last_char_states = bytearray(len(game.quote))
+            self._last_wpm = None
+            
+            # Render quote
+            self.render_quote(game, char_positions, 0, len(game.quote), force=True)
+            
+            # Show metadata instead of progress counter
+            if game.quote_metadata:
+                self.center_text(start_y + 2 + num_quote_lines + 1, game.quote_metadata, curses.A_DIM)
+        else:
+            # Only characters between the old and new typed length can have changed;
+            # typing can run past the end of the quote, which has nothing to draw
+            quote_len = len(game.quote)
+            lo = min(self._last_typed_len, typed_len)
+            if dirty_from is not None and dirty_from < lo:
+                lo = dirty_from
+            hi = min(max(self._last_typed_len, typed_len), quote_len)
+            if lo < hi:
+                self.render_quote(game, char_positions, lo, hi)
+        self._last_typed_len = typed_len
+        
+        # WPM display at top, redrawn only when it changes
+        wpm = game.calculate_wpm()
+        if wpm != self._last_wpm:
+            self._last_wpm = wpm
+            try:
+                self.stdscr.move(start_y, 0)
+                self.stdscr.clrtoeol()
+            except curses.error:
+                pass
+            if wpm > 0:
+                self.center_text(start_y, f"{wpm} wpm", curses.color_pair(5))
+        
+        self.stdscr.refresh()
+
+    def render_quote(self, game, char_positions, start, stop, force=False):
+        """Render quote characters in [start, stop) whose color-coded state changed"""
+        last_states = self._last_char_states
+        typed_len = len(game.typed_text)
+        
+        # Adjacent changed characters with the same state are drawn as one run
+        run_start = run_stop = None
+        run_y = run_x = next_x = run_state = None
+        
+        for char_index in range(start, stop):
+            if char_index < typed_len:
+                # Compare the normalized forms (handles accents)
+                if game.typed_norm[char_index] == game.quote_norm[char_index]:
+                    state = self.CHAR_CORRECT
+                else:
+                    state = self.CHAR_WRONG
+            else:
+                state = self.CHAR_UNTYPED
+            
+            if state == last_states[char_index] and not force:
+                continue
+            last_states[char_index] = state
+            
+            position = char_positions[char_index]
+            if position is None:
+                continue
+            
+            y, x = position
+            if char_index == run_stop and y == run_y and x == next_x and state == run_state:
+                run_stop += 1
+                next_x += 1
+                continue
+            
+            if run_start is not None:
+                self.draw_run(run_y, run_x, game.quote[run_start:run_stop], run_state)
+            run_start, run_stop = char_index, char_index + 1
+            run_y, run_x, next_x, run_state = y, x, x + 1, state
+        
+        if run_start is not None:
+            self.draw_run(run_y, run_x, game.quote[run_start:run_stop], run_state)
+    
+    def draw_run(self, y, x, text, state):
+        """Draw a run of quote characters that share one state"""
+        try:
+            self.stdscr.addstr(y, x, text, self.char_attr(state))
+        except curses.error:
+            pass
+    
+    def char_attr(self, state):
+        """Get the curses attribute for a quote character state"""
+        if state == self.CHAR_CORRECT:
+            return curses.color_pair(1)
+        if state == self.CHAR_WRONG:
+            return curses.color_pair(2) | curses.A_BOLD
+        return curses.color_pair(3) | curses.A_DIM
 
     def render_completion_screen(self, game, wpm, elapsed_time, tier):
         """Display completion for current round with reward tier"""
@@ -476,7 +636,7 @@ class CursesUI:
         self.center_text(y, "press any key to continue", curses.A_DIM)
         
         self.stdscr.refresh()
-        self.stdscr.getch()
+        self.wait_for_key()
     
     def render_session_summary(self, game):
         """Display session summary on exit"""
@@ -486,19 +646,17 @@ class CursesUI:
         self.center_text(y, "SESSION COMPLETE", curses.A_BOLD)
         y += 2
         
-        if game.session_stats:
-            total_rounds = len(game.session_stats)
-            avg_wpm = sum(s['wpm'] for s in game.session_stats) / total_rounds
-            best_wpm = max(s['wpm'] for s in game.session_stats)
+        wpms = game._wpm_list
+        if wpms:
+            total_rounds = len(wpms)
+            avg_wpm = sum(wpms) / total_rounds
+            best_wpm = max(wpms)
             
             self.center_text(y, f"{total_rounds} rounds  ·  {avg_wpm:.1f} avg wpm  ·  {best_wpm:.1f} best", curses.color_pair(4))
             
             # Show tier breakdown for session
             y += 1
-            tier_counts = {}
-            for stat in game.session_stats:
-                tier = stat.get('tier', 'unknown')
-                tier_counts[tier] = tier_counts.get(tier, 0) + 1
+            tier_counts = Counter(game._tier_list)
             
             tier_display = []
             for tier_key in ['pristine', 'exceptional', 'adequate', 'disaster']:
@@ -517,6 +675,46 @@ class CursesUI:
         time.sleep(2)
 
 
+def process_key(game, ch):
+    """Apply one keypress to the typed text without rendering
+    
+    Returns the lowest typed_text index that changed, or None if nothing did.
+    """
+    if ch in (curses.KEY_BACKSPACE, 127, 8):  # Backspace
+        if len(game.typed_text) > 0:
+            game.typed_text = game.typed_text[:-1]
+            game.typed_norm.pop()
+            return len(game.typed_text)
+            
+    elif ch == 3:  # Ctrl+C
+        raise KeyboardInterrupt
+
+    elif 32 <= ch <= 126:  # Printable ASCII
+        # Start timer on first character
+        if game.start_time is None:
+            game.start_time = time.time()
+        
+        # Printable ASCII never needs quote or accent normalization
+        char_to_add = chr(ch)
+        game.typed_text += char_to_add
+        game.typed_norm.append(char_to_add)
+        
+        # Track errors even if they'll be corrected
+        current_pos = len(game.typed_text) - 1
+        if current_pos < len(game.quote):
+            quote_char = game.quote[current_pos]
+            if quote_char < '\x80':
+                # Both ASCII: compare directly
+                if char_to_add != quote_char:
+                    game.errors += 1
+            elif char_to_add != game.quote_norm[current_pos]:
+                game.errors += 1
+        
+        return current_pos
+    
+    return None
+
+
 def main_curses(stdscr, quote_pack):
     """Main game loop with curses"""
     ui = CursesUI(stdscr)
@@ -528,59 +726,60 @@ def main_curses(stdscr, quote_pack):
         while True:
             game.load_quotes()
             game.reset_for_new_round()
+            # New quote, and pick up any resize that happened between rounds
+            ui.handle_resize()
             
             # Initial render
             ui.render_game_screen(game)
             
-            last_wpm = 0
-            
             # Game loop for this quote - continues until perfect match
-            while not game.is_complete():
+            while not game._completed:
                 try:
                     ch = stdscr.getch()
                 except KeyboardInterrupt:
                     raise
                 
-                should_render = False
-                
-                # Handle input
-                if ch in (curses.KEY_BACKSPACE, 127, 8):  # Backspace
-                    if len(game.typed_text) > 0:
-                        game.typed_text = game.typed_text[:-1]
-                        should_render = True
-                        
-                elif ch == 3:  # Ctrl+C
-                    raise KeyboardInterrupt
+                if ch == -1:
+                    # No key before the timeout: the renderer only redraws the WPM if it moved
+                    ui.render_game_screen(game)
+                    continue
                 
-                # MODIFICATION: Added shortcut to end the typing phase
-                elif ch == 24: # CTRL+X shortcut
-                    if game.start_time is None:
-                        game.start_time = time.time() # Ensure timer has started
-                    break # Exit the typing loop
-
-                elif 32 <= ch <= 126:  # Printable ASCII
-                    # Start timer on first character
-                    if game.start_time is None:
-                        game.start_time = time.time()
+                # Apply this key and everything already queued behind it, then render once
+                dirty_from = None  # Lowest typed_text index changed by the burst
+                resized = False
+                end_round = False
+                stdscr.nodelay(True)
+                while ch != -1:
+                    # MODIFICATION: Added shortcut to end the typing phase
+                    if ch == 24: # CTRL+X shortcut
+                        if game.start_time is None:
+                            game.start_time = time.time() # Ensure timer has started
+                        end_round = True
+                        break
                     
-                    char_to_add = game.normalize_text(chr(ch))
-                    game.typed_text += char_to_add
+                    if ch == curses.KEY_RESIZE:
+                        ui.handle_resize()
+                        resized = True
                     
-                    # Track errors even if they'll be corrected
-                    current_pos = len(game.typed_text) - 1
-                    if current_pos < len(game.quote):
-                        typed_normalized = game.normalize_accents(game.typed_text[current_pos])
-                        quote_normalized = game.normalize_accents(game.quote[current_pos])
-                        if typed_normalized != quote_normalized:
-                            game.errors += 1
+                    changed_at = process_key(game, ch)
+                    if changed_at is not None:
+                        if dirty_from is None or changed_at < dirty_from:
+                            dirty_from = changed_at
+                        # Completion can only change when typed_text does;
+                        # keys queued after the final character are left for the next screen
+                        game._completed = game.is_complete()
+                        if game._completed:
+                            break
                     
-                    should_render = True
+                    ch = stdscr.getch()
+                stdscr.timeout(ui.WPM_TICK_MS)
                 
-                # Render on changes or WPM updates
-                current_wpm = game.calculate_wpm()
-                if should_render or (current_wpm != last_wpm):
-                    ui.render_game_screen(game)
-                    last_wpm = current_wpm
+                if end_round:
+                    break # Exit the typing loop
+                
+                # Render on changes (the WPM display updates along with it)
+                if dirty_from is not None or resized:
+                    ui.render_game_screen(game, dirty_from)
             
             # Quote completed (or shortcut was used)
             game.end_time = time.time()
@@ -596,11 +795,7 @@ def main_curses(stdscr, quote_pack):
             tier = game.calculate_tier(final_wpm, game.errors)
             
             # Save stats
-            game.session_stats.append({
-                'wpm': final_wpm,
-                'time': elapsed_time,
-                'tier': tier
-            })
+            game.record_round(final_wpm, elapsed_time, tier)
             game.save_stats(final_wpm, elapsed_time, tier)
             
             # Show completion screen with tier
@@ -608,6 +803,8 @@ def main_curses(stdscr, quote_pack):
             
     except KeyboardInterrupt:
         ui.render_session_summary(game)
+    finally:
+        game.close()
 
 
 def main():